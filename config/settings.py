@@ -1 +1,26 @@
 # Settings and constants
+
+# CoinGecko markets endpoint
+API_URL = 'https://api.coingecko.com/api/v3/coins/markets'
+API_PARAMS = {
+    'vs_currency': 'usd',
+    'order': 'market_cap_desc',
+    'per_page': 250,
+    'page': 1,
+    'sparkline': 'false',
+    'price_change_percentage': '24h'
+}
+
+# Number of market pages fetched concurrently by the async fetcher
+MARKET_PAGES = 1
+
+# CoinGecko free tier: 30 requests per 60 seconds
+RATE_LIMIT_REQUESTS = 30
+RATE_LIMIT_PERIOD = 60
+
+# Minimum gap in seconds between sync requests to CoinGecko
+MIN_REQUEST_INTERVAL = 6.0
+
+# Short-TTL response cache (SQLite) so repeat runs skip the HTTP round-trip
+CACHE_NAME = 'coingecko_cache'
+CACHE_EXPIRE_AFTER = 60
@@ -1,42 +1,65 @@
 # main.py
-from utils.fetcher import fetch_crypto_data
-from utils.processor import add_enhanced_columns, process_crypto_data
-from utils.analyzer import get_top_gainers, get_top_losers, generate_market_summary
+import asyncio
+
+from config.settings import MARKET_PAGES
+from utils.fetcher import fetch_crypto_data, fetch_crypto_data_async, close_session
 from utils.display import (
     display_market_cap_leaders,
     display_top_gainers,
     display_top_losers,
     display_market_summary,
 )
-from utils.saver import save_all_datasets
 
-def main():
+def print_banner():
     print("=" * 60)
     print("🚀 Starting Cryptocurrency Data Fetch & Analysis")
     print("=" * 60)
 
-    raw_data = fetch_crypto_data()
+def run_analysis(raw_data):
     if not raw_data:
         print("No data fetched. Exiting.")
         return
 
-    enhanced = add_enhanced_columns(raw_data)
+    # The pandas stack is only imported once there is data to process, so
+    # importing this module and the fetch step stay cheap
+    from utils.dates import today_str
+    from utils.processor import add_enhanced_columns, process_crypto_data
+    from utils.analyzer import get_change_masks, get_top_gainers, get_top_losers, generate_market_summary
+    from utils.saver import save_all_datasets
+
+    # One date string per run, shared by the date column and the file names
+    today = today_str()
+
+    enhanced = add_enhanced_columns(raw_data, today)
     processed = process_crypto_data(enhanced)
 
-    top_gainers = get_top_gainers(processed)
-    top_losers = get_top_losers(processed)
-    summary = generate_market_summary(processed)
+    gainers_mask, losers_mask = get_change_masks(processed)
+    top_gainers = get_top_gainers(processed, gainers_mask=gainers_mask)
+    top_losers = get_top_losers(processed, losers_mask=losers_mask)
+    summary = generate_market_summary(processed, gainers_mask, losers_mask)
 
     display_market_cap_leaders(processed, 10)
     display_top_gainers(top_gainers)
     display_top_losers(top_losers)
     display_market_summary(summary)
 
-    save_all_datasets(enhanced, processed, top_gainers, top_losers)
+    save_all_datasets(enhanced, processed, top_gainers, top_losers, today=today, raw_data=raw_data)
 
     print("\n✅ Analysis complete. Data saved successfully.")
 
+def main():
+    print_banner()
+    run_analysis(fetch_crypto_data())
+
+async def main_async():
+    print_banner()
+    try:
+        raw_data = await fetch_crypto_data_async(MARKET_PAGES)
+    finally:
+        await close_session()
+    run_analysis(raw_data)
+
 if __name__ == '__main__':
-    main()
+    asyncio.run(main_async())
 else:
     print('Crypto Analyzer Started (imported as a module)')
@@ -1,35 +1,77 @@
 # Analyze top gainers and losers
-from typing import List, Dict
+import numpy as np
+import pandas as pd
 
-def get_top_gainers(data: List[Dict], limit=10):
-    gainers = [c for c in data if c['price_change_24h'] > 0]
-    top = sorted(gainers, key=lambda x: x['price_change_24h'], reverse=True)[:limit]
-    for i, coin in enumerate(top, 1):
-        coin['gainer_rank'] = i
-    return top
+def get_change_masks(data: pd.DataFrame):
+    change = data['price_change_24h'].to_numpy()
+    return change > 0, change < 0
+
+def _top_positions(change, mask, limit):
+    # Partial selection over the masked positions: O(n) argpartition finds the
+    # cutoff value, then only the survivors get sorted. Everything tied with
+    # the cutoff is kept, in index order, so ties resolve by rank exactly as
+    # a stable full sort would.
+    positions = np.flatnonzero(mask)
+    if len(positions) > limit:
+        values = change[positions]
+        cutoff = values[np.argpartition(values, limit - 1)[limit - 1]]
+        positions = positions[values <= cutoff]
+    return positions[np.argsort(change[positions], kind='stable')][:limit]
 
-def get_top_losers(data: List[Dict], limit=10):
-    losers = [c for c in data if c['price_change_24h'] < 0]
-    top = sorted(losers, key=lambda x: x['price_change_24h'])[:limit]
-    for i, coin in enumerate(top, 1):
-        coin['loser_rank'] = i
+def _ranked_slice(data, positions, rank_column):
+    # take() already returns a fresh frame, so the rank column is inserted in
+    # place instead of paying for a second copy through assign()
+    top = data.take(positions)
+    top.insert(len(top.columns), rank_column, np.arange(1, len(top) + 1, dtype=np.int32))
     return top
 
-def generate_market_summary(data: List[Dict]):
-    if not data: return {}
+def get_top_gainers(data: pd.DataFrame, limit=10, gainers_mask=None):
+    if gainers_mask is None:
+        gainers_mask, _ = get_change_masks(data)
+    change = data['price_change_24h'].to_numpy()
+    return _ranked_slice(data, _top_positions(-change, gainers_mask, limit), 'gainer_rank')
+
+def get_top_losers(data: pd.DataFrame, limit=10, losers_mask=None):
+    if losers_mask is None:
+        _, losers_mask = get_change_masks(data)
+    change = data['price_change_24h'].to_numpy()
+    return _ranked_slice(data, _top_positions(change, losers_mask, limit), 'loser_rank')
+
+def _python_value(value):
+    # Plain Python values for the summary: float32 through its shortest text
+    # form (18.40167, not 18.401670455932617), other numpy scalars via item(),
+    # NaN/NA as None
+    if pd.isna(value):
+        return None
+    if isinstance(value, np.float32):
+        return float(str(value))
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _row_dict(data, position):
+    return {column: _python_value(col.iat[position]) for column, col in data.items()}
+
+def generate_market_summary(data: pd.DataFrame, gainers_mask=None, losers_mask=None):
+    if data.empty: return {}
     total = len(data)
-    gainers = [c for c in data if c['price_change_24h'] > 0]
-    losers = [c for c in data if c['price_change_24h'] < 0]
-    neutral = [c for c in data if c['price_change_24h'] == 0]
-    top_gainer = max(data, key=lambda x: x['price_change_24h'])
-    top_loser = min(data, key=lambda x: x['price_change_24h'])
+    change = data['price_change_24h'].to_numpy()
+    if gainers_mask is None or losers_mask is None:
+        # Losers, neutral and gainers counted in one pass over the signs
+        losers_count, neutral_count, gainers_count = (
+            int(n) for n in np.bincount(np.sign(change).astype(np.intp) + 1, minlength=3)
+        )
+    else:
+        gainers_count = int(np.count_nonzero(gainers_mask))
+        losers_count = int(np.count_nonzero(losers_mask))
+        neutral_count = total - gainers_count - losers_count
     return {
         'total_coins': total,
-        'gainers_count': len(gainers),
-        'losers_count': len(losers),
-        'neutral_count': len(neutral),
-        'gainers_percentage': len(gainers) / total * 100,
-        'losers_percentage': len(losers) / total * 100,
-        'top_gainer': top_gainer,
-        'top_loser': top_loser
+        'gainers_count': gainers_count,
+        'losers_count': losers_count,
+        'neutral_count': neutral_count,
+        'gainers_percentage': gainers_count / total * 100,
+        'losers_percentage': losers_count / total * 100,
+        'top_gainer': _row_dict(data, int(change.argmax())),
+        'top_loser': _row_dict(data, int(change.argmin()))
     }
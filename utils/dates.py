@@ -0,0 +1,13 @@
+# Run date helpers shared by the processor and the saver
+
+from datetime import date
+
+# (date, formatted string) for the current day
+_today_cache = [None, None]
+
+def today_str() -> str:
+    # Format the date once per calendar day; every caller shares the string
+    today = date.today()
+    if _today_cache[0] != today:
+        _today_cache[:] = [today, today.strftime('%d-%m-%Y')]
+    return _today_cache[1]
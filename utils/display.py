@@ -1,54 +1,59 @@
 # utils/display.py
+import sys
+
+# Row templates, parsed once and shared by headers and rows
+_LEADER_ROW = "{:<5} {:<20} {:<8} {:<15} {:<12} {:<15}".format
+_MOVER_HEADER = "{:<20} {:<10} {:<10}".format
+_MOVER_ROW = "{:<20} {:<10} {:+.2f}%".format
+_PRICE = "${:,.2f}".format
+_CHANGE = "{:+.2f}%".format
+_MARKET_CAP = "${:,.0f}".format
+
+def _fmt_value(fmt, value):
+    # Zero, None and NaN (the only value not equal to itself) all show as N/A
+    return fmt(value) if value and value == value else "N/A"
+
+def _write_lines(lines):
+    # One write per table instead of one print per row
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 def display_market_cap_leaders(processed_data, limit=10):
-    print(f"\nTop {limit} Cryptocurrencies by Market Cap:")
-    print("-" * 80)
-    print(f"{'Rank':<5} {'Name':<20} {'Symbol':<8} {'Price':<15} {'24h Change':<12} {'Market Cap':<15}")
-    print("-" * 80)
+    lines = [
+        f"\nTop {limit} Cryptocurrencies by Market Cap:",
+        "-" * 80,
+        _LEADER_ROW('Rank', 'Name', 'Symbol', 'Price', '24h Change', 'Market Cap'),
+        "-" * 80,
+    ]
 
-    for coin in processed_data[:limit]:
-        rank = coin.get('rank', 'N/A')
-        name = coin.get('name', '')
-        symbol = coin.get('symbol', '').upper()
-        price = coin.get('current_price')
-        price_change = coin.get('price_change_24h', 0)
-        market_cap = coin.get('market_cap')
+    for coin in processed_data.head(limit).itertuples(index=False):
+        lines.append(_LEADER_ROW(
+            coin.rank, coin.name, coin.symbol,
+            _fmt_value(_PRICE, coin.current_price),
+            _fmt_value(_CHANGE, coin.price_change_24h),
+            _fmt_value(_MARKET_CAP, coin.market_cap),
+        ))
 
-        price_str = f"${price:,.2f}" if price else "N/A"
-        change_str = f"{price_change:+.2f}%" if price_change else "N/A"
-        market_cap_str = f"${market_cap:,.0f}" if market_cap else "N/A"
+    _write_lines(lines)
 
-        print(f"{rank:<5} {name:<20} {symbol:<8} {price_str:<15} {change_str:<12} {market_cap_str:<15}")
 
+def _display_movers(title, movers, limit):
+    lines = [title, "-" * 50, _MOVER_HEADER('Name', 'Symbol', '24h Change'), "-" * 50]
+    lines += [
+        _MOVER_ROW(coin.name, coin.symbol, coin.price_change_24h)
+        for coin in movers.head(limit).itertuples(index=False)
+    ]
+    _write_lines(lines)
 
-def display_top_gainers(top_gainers, limit=10):
-    print(f"\nTop {limit} Market Gainers (24h):")
-    print("-" * 50)
-    print(f"{'Name':<20} {'Symbol':<10} {'24h Change':<10}")
-    print("-" * 50)
 
-    for coin in top_gainers[:limit]:
-        name = coin.get('name', 'N/A')
-        symbol = coin.get('symbol', 'N/A').upper()
-        change = coin.get('price_change_24h', 0)
-        print(f"{name:<20} {symbol:<10} +{change:.2f}%")
+def display_top_gainers(top_gainers, limit=10):
+    _display_movers(f"\nTop {limit} Market Gainers (24h):", top_gainers, limit)
 
 
 def display_top_losers(top_losers, limit=10):
-    print(f"\nTop {limit} Market Losers (24h):")
-    print("-" * 50)
-    print(f"{'Name':<20} {'Symbol':<10} {'24h Change':<10}")
-    print("-" * 50)
-
-    for coin in top_losers[:limit]:
-        name = coin.get('name', 'N/A')
-        symbol = coin.get('symbol', 'N/A').upper()
-        change = coin.get('price_change_24h', 0)
-        print(f"{name:<20} {symbol:<10} {change:.2f}%")
+    _display_movers(f"\nTop {limit} Market Losers (24h):", top_losers, limit)
 
 
 def display_market_summary(summary):
-    print("\nMarket Summary:")
-    print("-" * 30)
-    for key, value in summary.items():
-        print(f"{key:<20}: {value}")
+    lines = ["\nMarket Summary:", "-" * 30]
+    lines += [f"{key:<20}: {value}" for key, value in summary.items()]
+    _write_lines(lines)
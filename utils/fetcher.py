@@ -1,28 +1,134 @@
 # Fetch data from API
 # utils/fetcher.py
-import requests, time
+import asyncio
+import time
 from datetime import datetime
 from typing import List, Dict, Optional
 
-def fetch_crypto_data() -> Optional[List[Dict]]:
-    url = 'https://api.coingecko.com/api/v3/coins/markets'
-    params = {
-        'vs_currency': 'usd',
-        'order': 'market_cap_desc',
-        'per_page': 250,
-        'page': 1,
-        'sparkline': False,
-        'price_change_percentage': '24h'
-    }
+import aiohttp
+import requests_cache
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from aiolimiter import AsyncLimiter
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from config.settings import (
+    API_URL,
+    API_PARAMS,
+    RATE_LIMIT_REQUESTS,
+    RATE_LIMIT_PERIOD,
+    CACHE_NAME,
+    CACHE_EXPIRE_AFTER,
+    MIN_REQUEST_INTERVAL,
+)
+
+_SYNC_SESSION: Optional[requests_cache.CachedSession] = None
+_LAST_REQUEST = float('-inf')
+
+_LIMITER: Optional[AsyncLimiter] = None
+_SESSION: Optional[CachedSession] = None
 
+def _throttle(min_gap: float = MIN_REQUEST_INTERVAL):
+    # Only wait out what is left of the gap since the last network request
+    delay = min_gap - (time.monotonic() - _LAST_REQUEST)
+    if delay > 0:
+        print(f"Applying rate limit ({delay:.1f} seconds)...")
+        time.sleep(delay)
+
+def _get_sync_session() -> requests_cache.CachedSession:
+    # Keep-alive session for the sync path: one host, one request at a time, so
+    # a single pooled connection is reused. Retry backs off on 429/5xx and
+    # honours Retry-After. Responses are cached for CACHE_EXPIRE_AFTER seconds,
+    # then revalidated with If-None-Match; a 304 reuses the stored body.
+    # Created on first use so importing the module opens no cache file.
+    global _SYNC_SESSION
+    if _SYNC_SESSION is None:
+        _SYNC_SESSION = requests_cache.CachedSession(CACHE_NAME, backend='sqlite', expire_after=CACHE_EXPIRE_AFTER)
+        _SYNC_SESSION.mount('https://', HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=1,
+            max_retries=Retry(total=5, backoff_factor=1.5, status_forcelist=[429, 502, 503, 504]),
+        ))
+    return _SYNC_SESSION
+
+def fetch_crypto_data() -> Optional[List[Dict]]:
+    global _LAST_REQUEST
     try:
-        print("Applying rate limit (6 seconds)...")
-        time.sleep(6)
-        response = requests.get(url, params=params, timeout=30)
+        session = _get_sync_session()
+        response = session.get(API_URL, params=API_PARAMS, only_if_cached=True)
+        if response.status_code == 504:
+            # Not cached or stale: this call goes to the network
+            _throttle()
+            response = session.get(API_URL, params=API_PARAMS, timeout=(3.05, 27))
+            _LAST_REQUEST = time.monotonic()
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content) if orjson is not None else response.json()
         print(f"Fetched {len(data)} coins at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         return data
     except Exception as e:
         print(f"Fetch error: {e}")
         return None
+
+def _get_session() -> CachedSession:
+    # One shared session and rate limiter per event loop; created lazily
+    # because both are bound to the loop they are first used in.
+    global _SESSION, _LIMITER
+    if _SESSION is None or _SESSION.closed:
+        _LIMITER = AsyncLimiter(RATE_LIMIT_REQUESTS, RATE_LIMIT_PERIOD)
+        _SESSION = CachedSession(
+            cache=SQLiteBackend(f'{CACHE_NAME}_async', expire_after=CACHE_EXPIRE_AFTER),
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300),
+        )
+    return _SESSION
+
+async def close_session():
+    global _SESSION, _LIMITER
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+    _LIMITER = None
+
+_BACKOFF = wait_exponential(multiplier=1, max=30)
+
+def _retry_wait(retry_state) -> float:
+    # A 429 tells us how long to wait in Retry-After (seconds); otherwise
+    # fall back to exponential backoff
+    error = retry_state.outcome.exception()
+    retry_after = (getattr(error, 'headers', None) or {}).get('Retry-After', '')
+    if getattr(error, 'status', None) == 429 and retry_after.isdigit():
+        return float(retry_after)
+    return _BACKOFF(retry_state)
+
+async def _fetch_page(session: CachedSession, page: int) -> List[Dict]:
+    retrying = AsyncRetrying(
+        wait=_retry_wait,
+        retry=retry_if_exception_type(aiohttp.ClientError),
+        stop=stop_after_attempt(5),
+        reraise=True,
+    )
+    async for attempt in retrying:
+        with attempt:
+            async with _LIMITER:
+                async with session.get(API_URL, params={**API_PARAMS, 'page': page}) as response:
+                    response.raise_for_status()
+                    if orjson is not None:
+                        return orjson.loads(await response.read())
+                    return await response.json()
+
+async def fetch_crypto_data_async(pages: int = 1) -> Optional[List[Dict]]:
+    session = _get_session()
+    try:
+        results = await asyncio.gather(*(_fetch_page(session, page) for page in range(1, pages + 1)))
+    except Exception as e:
+        print(f"Fetch error: {e}")
+        return None
+    data = [coin for page in results for coin in page]
+    print(f"Fetched {len(data)} coins at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    return data
@@ -1,36 +1,83 @@
 # Process and clean data
 
-from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-def add_enhanced_columns(data: List[Dict]) -> List[Dict]:
-    today = datetime.now().strftime('%d-%m-%Y')
-    for coin in data:
-        price_change = coin.get('price_change_percentage_24h')
-        coin['date'] = today
-        coin['price_change_24h'] = float(price_change) if price_change else 0.0
-        coin['change_symbol'] = "UP" if coin['price_change_24h'] > 0 else "DOWN"
-    return data
+import numpy as np
+import pandas as pd
 
-def process_crypto_data(data: List[Dict]) -> List[Dict]:
-    processed = []
-    for coin in data:
-        processed.append({
-            'id': coin.get('id', ''),
-            'rank': coin.get('market_cap_rank'),
-            'name': coin.get('name', ''),
-            'symbol': coin.get('symbol', '').upper(),
-            'current_price': coin.get('current_price'),
-            'price_change_24h': coin.get('price_change_24h', 0),
-            'change_symbol': coin.get('change_symbol', 'DOWN'),
-            'market_cap': coin.get('market_cap'),
-            'volume_24h': coin.get('total_volume'),
-            'ath': coin.get('ath'),
-            'image': coin.get('image', ''),
-            'date': coin.get('date', ''),
-            'last_updated': coin.get('last_updated', '')
-        })
-    processed.sort(key=lambda x: x['rank'] if x['rank'] else float('inf'))
-    for i, coin in enumerate(processed, 1):
-        coin['number'] = i
+from utils.dates import today_str
+
+# Source column -> processed column, in output order
+PROCESSED_COLUMNS = {
+    'id': 'id',
+    'market_cap_rank': 'rank',
+    'name': 'name',
+    'symbol': 'symbol',
+    'current_price': 'current_price',
+    'price_change_24h': 'price_change_24h',
+    'change_symbol': 'change_symbol',
+    'market_cap': 'market_cap',
+    'total_volume': 'volume_24h',
+    'ath': 'ath',
+    'image': 'image',
+    'date': 'date',
+    'last_updated': 'last_updated',
+}
+TEXT_COLUMNS = ['id', 'name', 'symbol', 'image', 'date', 'last_updated']
+# float64 for monetary magnitudes (float32 keeps only ~7 significant digits,
+# too few for market caps), float32 for the 24h percentage
+PROCESSED_DTYPES = {
+    'current_price': 'float64',
+    'price_change_24h': 'float32',
+    'market_cap': 'float64',
+    'volume_24h': 'float64',
+    'ath': 'float64',
+}
+
+def add_enhanced_columns(data: List[Dict], today: Optional[str] = None) -> pd.DataFrame:
+    df = pd.DataFrame(data)
+    df['date'] = today or today_str()
+    # A payload without the field at all counts as no change, like a null one
+    change = pd.to_numeric(
+        df.get('price_change_percentage_24h', pd.Series(np.nan, index=df.index)),
+        errors='coerce',
+    )
+    # Kept float64 here: this frame is the published raw dataset, and only the
+    # processed frame narrows the percentage to float32 (PROCESSED_DTYPES)
+    df['price_change_24h'] = change.fillna(0.0).astype('float64')
+    df['change_symbol'] = np.where(df['price_change_24h'] > 0, 'UP', 'DOWN')
+    return df
+
+def process_crypto_data(df: pd.DataFrame) -> pd.DataFrame:
+    # One projection of the needed columns and one row gather in rank order;
+    # the fixes below only touch the columns they change.
+    processed = df.reindex(columns=list(PROCESSED_COLUMNS))
+    processed.columns = list(PROCESSED_COLUMNS.values())
+    # The API already returns coins in market-cap order, so the sort and row
+    # gather only run when that order is broken (missing ranks sort last)
+    ranks = processed['rank'].to_numpy(dtype='float64', na_value=np.nan)
+    if not (ranks[1:] >= ranks[:-1]).all():
+        processed = processed.take(np.argsort(ranks, kind='stable'))
+        processed.index = pd.RangeIndex(len(processed))
+
+    for column, dtype in PROCESSED_DTYPES.items():
+        processed[column] = processed[column].astype(dtype)
+    for column in TEXT_COLUMNS:
+        if processed[column].hasnans:
+            processed[column] = processed[column].fillna('')
+    processed['symbol'] = processed['symbol'].str.upper()
+    # Fixed Int32 so every daily file has the same schema, whatever the ranks;
+    # CoinGecko ranks run past Int16's 32767 once enough pages are fetched
+    processed['rank'] = processed['rank'].astype('Int32')
+    # Build the categoricals from values already in hand instead of hashing the
+    # strings again: UP/DOWN follows the sign of the change, and a run's rows
+    # all share one date
+    change = processed['price_change_24h'].to_numpy()
+    processed['change_symbol'] = pd.Categorical.from_codes((change > 0).astype(np.int8), ['DOWN', 'UP'])
+    dates = processed['date'].to_numpy()
+    if len(dates) and (dates == dates[0]).all():
+        processed['date'] = pd.Categorical.from_codes(np.zeros(len(dates), dtype=np.int8), [dates[0]])
+    else:
+        processed['date'] = processed['date'].astype('category')
+    processed['number'] = np.arange(1, len(processed) + 1, dtype=np.int32)
     return processed
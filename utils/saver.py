@@ -1,51 +1,208 @@
-import os
+import csv
+import io
 import json
+import os
+import numpy as np
 import pandas as pd
-from datetime import datetime
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from utils.dates import today_str
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _write_atomic(write, filename):
+    # Write to a sibling temp file and rename it into place, so readers
+    # never observe a partially written dataset.
+    tmp = f'{filename}.tmp'
+    try:
+        write(tmp)
+        os.replace(tmp, filename)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def _as_frame(data):
+    # Frames are written as-is; only list-of-dicts input is converted
+    return data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+
+def _records(df):
+    # Pull each column out once as Python values, then zip rows into dicts;
+    # several times faster than DataFrame.to_dict('records')
+    keys = [str(column) for column in df.columns]
+    columns = [col.tolist() for _, col in df.items()]
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+def _enhanced_records(raw_data, enhanced_df):
+    # The raw API dicts plus the columns add_enhanced_columns derived; skips
+    # rebuilding every row from the frame and keeps the API's own int/float
+    # values rather than pandas' upcasts
+    derived = zip(
+        enhanced_df['date'].tolist(),
+        enhanced_df['price_change_24h'].tolist(),
+        enhanced_df['change_symbol'].tolist(),
+    )
+    return [
+        {**coin, 'date': day, 'price_change_24h': change, 'change_symbol': symbol}
+        for coin, (day, change, symbol) in zip(raw_data, derived)
+    ]
+
+def _json_default(obj):
+    # orjson handles NaN and numpy scalars itself; pd.NA still needs mapping
+    if obj is pd.NA:
+        return None
+    raise TypeError
 
 def save_to_json(data, filename):
     try:
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        if orjson is not None:
+            records = _records(data) if isinstance(data, pd.DataFrame) else data
+            payload = orjson.dumps(
+                records,
+                default=_json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            )
+
+            def write(path):
+                with open(path, 'wb') as f:
+                    f.write(payload)
+        elif isinstance(data, pd.DataFrame):
+            def write(path):
+                data.to_json(path, orient='records', indent=2)
+        else:
+            def write(path):
+                with open(path, 'w') as f:
+                    json.dump(data, f, indent=2)
+
+        _write_atomic(write, filename)
         print(f"JSON saved successfully: {filename}")
         return True
     except Exception as e:
         print(f"Error saving JSON {filename}: {e}")
         return False
 
+def _csv_cells(col):
+    # Render one column as CSV cells with a formatter chosen per dtype;
+    # missing values become empty cells.
+    kind = col.dtype.kind
+    if isinstance(col.dtype, pd.StringDtype):
+        cells = col.to_numpy(dtype=object)
+    elif isinstance(col.dtype, pd.api.extensions.ExtensionDtype):
+        # Nullable dtypes (e.g. Int64) go through object to keep ints
+        cells = np.array([str(v) for v in col.to_numpy(dtype=object)], dtype=object)
+    elif kind in 'iub':
+        cells = np.array(list(map(str, col.to_numpy().tolist())), dtype=object)
+    elif kind == 'f' and col.dtype.itemsize == 8:
+        # repr of a Python float is the shortest round-trip form, as in to_csv
+        cells = np.array(list(map(repr, col.to_numpy().tolist())), dtype=object)
+    elif kind == 'f':
+        cells = col.to_numpy().astype(str).astype(object)
+    else:
+        cells = np.array([str(v) for v in col.to_numpy()], dtype=object)
+    if col.hasnans:
+        cells[col.isna().to_numpy()] = ''
+    return cells
+
+def fast_to_csv(df, path):
+    # csv.writer quotes only the cells that need it, in C
+    columns = [_csv_cells(col) for _, col in df.items()]
+    with io.BufferedWriter(io.FileIO(path, 'w'), 1 << 20) as raw, \
+            io.TextIOWrapper(raw, encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(df.columns.astype(str))
+        writer.writerows(zip(*columns))
+
 def save_to_csv(data, filename):
     try:
-        df = pd.DataFrame(data)
-        df.to_csv(filename, index=False)
+        df = _as_frame(data)
+        _write_atomic(lambda path: fast_to_csv(df, path), filename)
         print(f"CSV saved successfully: {filename}")
         return True
     except Exception as e:
         print(f"Error saving CSV {filename}: {e}")
         return False
 
-def save_all_datasets(raw_data, processed_data, top_gainers, top_losers):
+def _arrow_table(data):
+    # Columns come straight from the API, so one malformed value (e.g. 'n/a'
+    # in a numeric field) can leave an object column pyarrow cannot convert.
+    # Only those columns fall back to strings; the rest keep their types.
+    df = _as_frame(data)
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    mixed = {}
+    for column, col in df.items():
+        if col.dtype == object:
+            try:
+                pa.array(col, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                mixed[column] = col.astype('string')
+    return pa.Table.from_pandas(df.assign(**mixed), preserve_index=False)
+
+def save_to_parquet(data, filename):
+    try:
+        table = _arrow_table(data)
+        _write_atomic(lambda path: pq.write_table(table, path, compression='zstd'), filename)
+        print(f"Parquet saved successfully: {filename}")
+        return True
+    except Exception as e:
+        print(f"Error saving Parquet {filename}: {e}")
+        return False
+
+def save_to_feather(data, filename):
+    try:
+        table = _arrow_table(data)
+        _write_atomic(lambda path: feather.write_feather(table, path, compression='zstd'), filename)
+        print(f"Feather saved successfully: {filename}")
+        return True
+    except Exception as e:
+        print(f"Error saving Feather {filename}: {e}")
+        return False
+
+SAVERS = {
+    'json': save_to_json,
+    'csv': save_to_csv,
+    'parquet': save_to_parquet,
+    'feather': save_to_feather,
+}
+
+def save_all_datasets(enhanced_df, processed_df, gainers_df, losers_df, fmt='parquet', slice_fmt='csv', today=None, raw_data=None):
+    # fmt applies to the full datasets; the 10-row top slices are meant to be
+    # read by people and are smaller as CSV than with Parquet's metadata
+    for name in (fmt, slice_fmt):
+        if name not in ('csv', 'parquet', 'feather'):
+            raise ValueError(f"Unsupported format: {name}")
+    # The fetched list, if any, comes in through raw_data; enhanced_df is
+    # always the frame add_enhanced_columns built
+    if not isinstance(enhanced_df, pd.DataFrame):
+        raise TypeError("enhanced_df must be a DataFrame; pass the fetched list as raw_data")
+
     print("Saving all datasets...")
 
     # Ensure 'data/' directory exists
     os.makedirs('data', exist_ok=True)
 
-    today = datetime.now().strftime('%d-%m-%Y')
+    today = today or today_str()
+
+    # With the fetched list at hand the JSON is written from it directly
+    json_data = enhanced_df if raw_data is None else _enhanced_records(raw_data, enhanced_df)
 
     files = [
-        (raw_data, os.path.join('data', f'crypto_data_{today}.json'), 'json'),
-        (raw_data, os.path.join('data', f'crypto_data_{today}.csv'), 'csv'),
-        (processed_data, os.path.join('data', f'processed_crypto_data_{today}.csv'), 'csv'),
-        (top_gainers, os.path.join('data', f'top_10_positive_{today}.csv'), 'csv'),
-        (top_losers, os.path.join('data', f'top_10_negative_{today}.csv'), 'csv'),
+        (json_data, os.path.join('data', f'crypto_data_{today}.json'), 'json'),
+        (enhanced_df, os.path.join('data', f'crypto_data_{today}.{fmt}'), fmt),
+        (processed_df, os.path.join('data', f'processed_crypto_data_{today}.{fmt}'), fmt),
+        (gainers_df, os.path.join('data', f'top_10_positive_{today}.{slice_fmt}'), slice_fmt),
+        (losers_df, os.path.join('data', f'top_10_negative_{today}.{slice_fmt}'), slice_fmt),
     ]
 
-    success_count = 0
-    for data, filename, ftype in files:
-        if ftype == 'json':
-            if save_to_json(data, filename):
-                success_count += 1
-        else:
-            if save_to_csv(data, filename):
-                success_count += 1
+    # Written one after another: orjson and the csv module hold the GIL and the
+    # files are a few hundred KB, so worker threads only added overhead
+    success_count = sum(SAVERS[ftype](df, filename) for df, filename, ftype in files)
 
     print(f"Finished saving {success_count}/{len(files)} files.")